@@ -2,184 +2,736 @@
 
 # Minecraft launcher (temporary for beta versions).
 
-import minecraft_launcher_lib
 import subprocess
+import contextlib
+import email.utils
+import hashlib
 import uuid
+import time
 import sys
 import json
+import os
+import re
 import platform
 import logging
-import urllib3
-import requests
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from packaging import version as pkg_version
 
-# HTTP timeouts.
-requests.adapters.DEFAULT_RETRIES = 3
-requests.adapters.DEFAULT_TIMEOUT = 30
+# orjson is optional, but much faster for the manifest and log streaming paths.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# urllib3 timeouts.
-urllib3.util.timeout.DEFAULT_TIMEOUT = 30
+log = logging.getLogger(__name__)
+
+# HTTP timeout in seconds, passed to every request explicitly.
+HTTP_TIMEOUT = 30
+
+# Version manifest cache shared between launcher invocations.
+MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+MANIFEST_CACHE = Path.home() / ".cache" / "frogdream" / "version_manifest.json"
+MANIFEST_TTL = 60 * 60
+
+# Launch commands cached per version and option set.
+COMMAND_CACHE_DIR = Path.home() / ".cache" / "frogdream" / "cmd"
+_USERNAME_PLACEHOLDER = "${frogdream_username}"
+_UUID_PLACEHOLDER = "${frogdream_uuid}"
+
+
+# Host platform can't change while the launcher is running.
+_IS_APPLE_SILICON = platform.system() == "Darwin" and platform.machine() == "arm64"
+
+# Snapshot ids such as 25w35a, capturing the two-digit year.
+_SNAPSHOT_RE = re.compile(r"(\d{2})w\d{2}")
+
+# Release ids such as 1.20.2, 1.20.2-pre1 or 1.20.2-rc1, loader ids like 1.20.4-forge-49.0.3 stay unrecognised.
+_VER_RE = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?(-(?:pre|rc)\d+)?$")
+
+# First release that runs natively on Apple Silicon.
+_ROSETTA_PIVOT = (1, 20, 2, 1)
+
+# Default JVM arguments for every launch.
+# Game output is forwarded as raw bytes, so force UTF-8 instead of the platform console encoding
+# (file.encoding covers Java 8-17, stdout/stderr.encoding Java 18+).
+JVM_ARGUMENTS = (
+    "-Xmx2G",
+    "-Xms1G",
+    "-Dfile.encoding=UTF-8",
+    "-Dstdout.encoding=UTF-8",
+    "-Dstderr.encoding=UTF-8",
+)
+
+# Pipe buffer sizes for reading Minecraft output.
+LOG_READ_SIZE = 1 << 16
+LOG_PIPE_SIZE = 1 << 20
+
+# Shared HTTP session, so repeated downloads reuse keep-alive connections.
+# Built on first use, so commands that never download don't pay for importing requests.
+@lru_cache(maxsize=1)
+def _get_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Retries have to be configured on the adapter, module-level defaults are bound when adapters are created.
+    # The pool is sized for minecraft_launcher_lib's download thread pools (up to 32 workers).
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    ))
+    return session
 
 # Get Minecraft directory.
 def get_minecraft_directory():
+    import minecraft_launcher_lib
     return minecraft_launcher_lib.utils.get_minecraft_directory()
 
+# JSON helpers that use orjson when available.
+def _json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumpb(obj):
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+# Read the cached version manifest.
+def _read_manifest_cache():
+    with open(MANIFEST_CACHE, "rb") as f:
+        return _json_loads(f.read())
+
+# Parsed manifest kept for the lifetime of the process, as (cache file mtime_ns, manifest).
+_manifest_memo = None
+
+# Memoize the manifest in-process, so serve mode doesn't re-read and re-parse it per command.
+def _load_manifest_cached(force=False):
+    """Return the version manifest, re-reading it only when the cache file changed, went stale or force is set"""
+    global _manifest_memo
+    if not force and _manifest_memo is not None:
+        # The memo follows the cache file, so it is never older than MANIFEST_TTL allows
+        try:
+            cache_stat = MANIFEST_CACHE.stat()
+        except OSError:
+            cache_stat = None
+        if cache_stat is not None and cache_stat.st_mtime_ns == _manifest_memo[0] \
+                and time.time() - cache_stat.st_mtime < MANIFEST_TTL:
+            return _manifest_memo[1]
+
+    manifest = _load_manifest_from_disk(force)
+    try:
+        _manifest_memo = (MANIFEST_CACHE.stat().st_mtime_ns, manifest)
+    except OSError:
+        _manifest_memo = None
+    return manifest
+
+# Load version manifest from disk, revalidating it with Mojang once it's stale.
+def _load_manifest_from_disk(force=False):
+    """Return the version manifest, downloading it only when the cache is outdated or force is set"""
+    import requests
+
+    etag_file = MANIFEST_CACHE.with_suffix(".etag")
+
+    try:
+        cache_stat = MANIFEST_CACHE.stat()
+    except OSError:
+        cache_stat = None
+
+    # Fresh cache, skip the HTTP round trip entirely
+    if not force and cache_stat is not None and time.time() - cache_stat.st_mtime < MANIFEST_TTL:
+        try:
+            return _read_manifest_cache()
+        except ValueError:
+            cache_stat = None
+
+    MANIFEST_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = MANIFEST_CACHE.with_suffix(".tmp")
+
+    while True:
+        headers = {}
+        if cache_stat is not None:
+            headers["If-Modified-Since"] = email.utils.formatdate(cache_stat.st_mtime, usegmt=True)
+            try:
+                headers["If-None-Match"] = etag_file.read_text().strip()
+            except OSError:
+                pass
+
+        try:
+            with _get_session().get(MANIFEST_URL, headers=headers, stream=True, timeout=HTTP_TIMEOUT) as response:
+                response.raise_for_status()
+
+                # Not modified, just bump the cache timestamp
+                if response.status_code == 304:
+                    try:
+                        manifest = _read_manifest_cache()
+                    except ValueError:
+                        # Corrupt cache, ask again without the validators
+                        cache_stat = None
+                        continue
+                    os.utime(MANIFEST_CACHE)
+                    return manifest
+
+                # Stream straight to disk and parse from there, so no decoded text copy of the body is made
+                response.raw.decode_content = True
+                with open(tmp_file, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, length=64 * 1024)
+                etag = response.headers.get("ETag")
+        except requests.RequestException as e:
+            if cache_stat is None:
+                raise
+            try:
+                manifest = _read_manifest_cache()
+            except ValueError:
+                raise e
+            log.warning("Failed to refresh version manifest, using cached copy: %s", e)
+            return manifest
+        break
+
+    try:
+        with open(tmp_file, "rb") as f:
+            manifest = _json_loads(f.read())
+    except ValueError as e:
+        # Captive portal page or truncated body, keep serving the last good copy
+        tmp_file.unlink(missing_ok=True)
+        if cache_stat is None:
+            raise
+        log.warning("Version manifest refresh returned invalid JSON, using cached copy: %s", e)
+        return _read_manifest_cache()
+
+    # Replace atomically so a concurrent invocation never reads a partial file
+    os.replace(tmp_file, MANIFEST_CACHE)
+
+    if etag:
+        etag_file.write_text(etag)
+    else:
+        etag_file.unlink(missing_ok=True)
+
+    return manifest
+
+# Stream a file to disk without buffering the whole body in memory.
+def _download_file(url, path, sha1=None):
+    """Download url into path, verifying the SHA1 checksum while writing if given"""
+    import minecraft_launcher_lib
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(path.name + ".part")
+    digest = hashlib.sha1()
+
+    with _get_session().get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        with open(tmp_file, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+                digest.update(chunk)
+
+    if sha1 is not None and digest.hexdigest() != sha1:
+        tmp_file.unlink()
+        raise minecraft_launcher_lib.exceptions.InvalidChecksum(url, str(path), sha1, digest.hexdigest())
+
+    os.replace(tmp_file, path)
+
+def _manifest_entry(manifest, version):
+    return next((v for v in manifest["versions"] if v["id"] == version), None)
+
+# Download version JSON using the cached manifest.
+def _fetch_version_json(version, minecraft_directory):
+    """Make sure the version JSON exists locally so minecraft_launcher_lib doesn't fetch the manifest"""
+    import minecraft_launcher_lib
+
+    version_json = Path(minecraft_directory) / "versions" / version / f"{version}.json"
+    if not version_json.exists():
+        entry = _manifest_entry(_load_manifest_cached(), version)
+        if entry is None:
+            # A fresh cache can predate a new release or snapshot, revalidate once before giving up
+            entry = _manifest_entry(_load_manifest_cached(force=True), version)
+        if entry is None:
+            raise minecraft_launcher_lib.exceptions.VersionNotFound(version)
+
+        _download_file(entry["url"], version_json, sha1=entry["sha1"])
+
+    # Modded profiles inherit from a vanilla version, resolve that one through the cache too
+    with open(version_json, "rb") as f:
+        parent = _json_loads(f.read()).get("inheritsFrom")
+    if parent:
+        try:
+            _fetch_version_json(parent, minecraft_directory)
+        except minecraft_launcher_lib.exceptions.VersionNotFound:
+            # minecraft_launcher_lib tolerates a missing parent as well
+            pass
+
 def is_apple_silicon():
-    return platform.system() == "Darwin" and platform.machine() == "arm64"
+    return _IS_APPLE_SILICON
+
+# Pre-classic, classic, indev, infdev, alpha and beta ids (rd-132211, c0.30, a1.2.6, b1.7.3, ...).
+def _is_legacy(minecraft_version):
+    return minecraft_version.startswith(("rd-", "c0", "in-", "inf-", "a1", "b1"))
 
+# Turn a release id into a comparable (major, minor, patch, is_final) tuple.
+@lru_cache(maxsize=256)
+def _mc_tuple(minecraft_version):
+    match = _VER_RE.match(minecraft_version)
+    if not match:
+        # Unrecognised ids sort before every release
+        return (0, 0, 0, 0)
+    major, minor, patch, suffix = match.groups()
+    # Pre-releases and release candidates sort before their release
+    return (int(major), int(minor), int(patch or 0), 0 if suffix else 1)
+
+@lru_cache(maxsize=256)
 def needs_rosetta(minecraft_version):
-    if not is_apple_silicon():
+    if not _IS_APPLE_SILICON:
         return False
-    
+
+    # Legacy versions never run natively, skip version parsing entirely
+    if _is_legacy(minecraft_version):
+        return True
+
+    # Handle snapshot versions (e.g., 25w35a)
+    snapshot = _SNAPSHOT_RE.match(minecraft_version)
+    if snapshot:
+        # Extract year from snapshot (e.g., "25" from "25w35a")
+        year = int(snapshot.group(1))
+        # Snapshots from 2023 (23w) and later support ARM64 natively
+        return year < 23
+
+    # Versions before 1.20.2 need Rosetta on Apple Silicon, unknown ids are assumed to need it for safety
+    return _mc_tuple(minecraft_version) < _ROSETTA_PIVOT
+
+# Route minecraft_launcher_lib's HTTP traffic through the shared session.
+@contextlib.contextmanager
+def _shared_session():
+    """Make requests.get/requests.session use the shared session while active"""
+    import requests
+
+    session = _get_session()
+    original_get, original_session = requests.get, requests.session
+    requests.get = session.get
+    requests.session = lambda: session
     try:
-        # Handle snapshot versions (e.g., 25w35a)
-        if 'w' in minecraft_version and minecraft_version[0:2].isdigit():
-            # Extract year from snapshot (e.g., "25" from "25w35a")
-            year = int(minecraft_version[0:2])
-            # Snapshots from 2023 (23w) and later support ARM64 natively
-            return year < 23
-        
-        # Versions before 1.20.2 need Rosetta on Apple Silicon
-        return pkg_version.parse(minecraft_version) < pkg_version.parse("1.20.2")
-    except:
-        # If version parsing fails, assume it needs Rosetta for safety
+        yield
+    finally:
+        requests.get, requests.session = original_get, original_session
+
+# SHA1 of a file, hashed by OpenSSL in large blocks with the GIL released.
+def _sha1_file(path):
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha1").hexdigest()
+
+        # Python < 3.11, read 1 MiB at a time into a reused buffer
+        digest = hashlib.sha1()
+        buffer = memoryview(bytearray(1 << 20))
+        while n := f.readinto(buffer):
+            digest.update(buffer[:n])
+        return digest.hexdigest()
+
+# minecraft_launcher_lib hashes every existing file in 64 KiB Python-level reads, use the faster hasher.
+@contextlib.contextmanager
+def _fast_sha1():
+    """Make minecraft_launcher_lib verify files with _sha1_file while active"""
+    from minecraft_launcher_lib import _helper, runtime
+
+    original_helper, original_runtime = _helper.get_sha1_hash, runtime.get_sha1_hash
+    _helper.get_sha1_hash = runtime.get_sha1_hash = _sha1_file
+    try:
+        yield
+    finally:
+        _helper.get_sha1_hash, runtime.get_sha1_hash = original_helper, original_runtime
+
+# Start the downloads minecraft_launcher_lib would otherwise do one after another.
+def _prefetch_version_files(version, minecraft_directory, executor):
+    """Submit client JAR, asset index and logging config downloads to executor"""
+    path = Path(minecraft_directory)
+    with open(path / "versions" / version / f"{version}.json", "rb") as f:
+        data = _json_loads(f.read())
+
+    files = []
+    if "client" in data.get("downloads", {}):
+        files.append((data["downloads"]["client"], path / "versions" / version / f"{version}.jar"))
+    if "assetIndex" in data:
+        files.append((data["assetIndex"], path / "assets" / "indexes" / f"{data['assets']}.json"))
+    if data.get("logging"):
+        log_config = data["logging"]["client"]["file"]
+        files.append((log_config, path / "assets" / "log_configs" / log_config["id"]))
+
+    # Existing files are left for minecraft_launcher_lib to verify
+    return [
+        executor.submit(_download_file, info["url"], target, sha1=info["sha1"])
+        for info, target in files
+        if not target.exists()
+    ]
+
+# Marker written next to the version JSON once an install has completed.
+def _install_marker(version, minecraft_directory):
+    return Path(minecraft_directory) / "versions" / version / ".frogdream-installed"
+
+# Stamp a version by every JSON in its inheritsFrom chain, since installs and launch commands read them all.
+def _version_stamp(version, minecraft_directory):
+    """Return (stamp, client jar path, Java runtime component) for version, or None if a JSON in its chain is missing"""
+    versions_dir = Path(minecraft_directory) / "versions"
+    parts = []
+    seen = set()
+    jar = None
+    java_component = None
+    current = version
+    # Guard against a self-referencing or cyclic inheritsFrom
+    while current is not None and current not in seen:
+        seen.add(current)
+        json_path = versions_dir / current / f"{current}.json"
+        try:
+            mtime_ns = json_path.stat().st_mtime_ns
+            with open(json_path, "rb") as f:
+                data = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        parts += [current, mtime_ns]
+        # Like minecraft_launcher_lib's inherit_json, the child's values win over its parents'
+        jar = jar or data.get("jar")
+        java_component = java_component or data.get("javaVersion", {}).get("component")
+        current = data.get("inheritsFrom")
+
+    jar = jar or version
+    return json.dumps(parts), versions_dir / jar / f"{jar}.jar", java_component
+
+# List every file a launch needs, resolved the way minecraft_launcher_lib's installer lays them out.
+def _expected_files(version, minecraft_directory):
+    """Return (files, asset index path) for an installed version, or None if one of them is missing"""
+    from minecraft_launcher_lib import _helper, runtime
+    from minecraft_launcher_lib.natives import get_natives
+
+    stamp = _version_stamp(version, minecraft_directory)
+    if stamp is None:
+        return None
+
+    with open(Path(minecraft_directory) / "versions" / version / f"{version}.json", "rb") as f:
+        data = _json_loads(f.read())
+    if "inheritsFrom" in data:
+        data = _helper.inherit_json(data, minecraft_directory)
+
+    libraries_dir = Path(minecraft_directory) / "libraries"
+    files = [stamp[1]]
+    for library in data.get("libraries", []):
+        if "rules" in library and not _helper.parse_rule_list(library["rules"], {}):
+            continue
+        native = get_natives(library)
+        if "downloads" in library:
+            artifact = library["downloads"].get("artifact", {})
+            if artifact.get("url") and "path" in artifact:
+                files.append(libraries_dir / artifact["path"])
+        else:
+            files.append(Path(_helper.get_library_path(library["name"], minecraft_directory)))
+        if native:
+            native_jar = Path(_helper.get_library_path(library["name"], minecraft_directory))
+            files.append(native_jar.with_name(f"{native_jar.stem}-{native}.jar"))
+            files.append(Path(minecraft_directory) / "versions" / data["id"] / "natives")
+
+    if data.get("logging"):
+        files.append(Path(minecraft_directory) / "assets" / "log_configs" / data["logging"]["client"]["file"]["id"])
+
+    if stamp[2] is not None:
+        java_path = runtime.get_executable_path(stamp[2], minecraft_directory)
+        if java_path is None:
+            return None
+        files.append(Path(java_path))
+
+    asset_index = None
+    if "assetIndex" in data:
+        asset_index = Path(minecraft_directory) / "assets" / "indexes" / f"{data['assets']}.json"
+        files.append(asset_index)
+
+    if not all(path.exists() for path in files) or not _assets_present(asset_index, minecraft_directory):
+        return None
+    return [str(path) for path in files], str(asset_index) if asset_index else None
+
+# Asset objects are listed by hash in the index, check each one is on disk.
+def _assets_present(asset_index, minecraft_directory):
+    if asset_index is None:
         return True
+    try:
+        with open(asset_index, "rb") as f:
+            objects = _json_loads(f.read())["objects"]
+    except (OSError, ValueError, KeyError):
+        return False
+    objects_dir = os.path.join(minecraft_directory, "assets", "objects")
+    return all(
+        os.path.isfile(os.path.join(objects_dir, entry["hash"][:2], entry["hash"]))
+        for entry in objects.values()
+    )
+
+# Stat everything the marker lists, that's far cheaper than minecraft_launcher_lib re-hashing it all.
+def _is_installed(version, minecraft_directory):
+    stamp = _version_stamp(version, minecraft_directory)
+    if stamp is None:
+        return False
+    try:
+        with open(_install_marker(version, minecraft_directory), "rb") as f:
+            marker = _json_loads(f.read())
+        if marker["stamp"] != stamp[0]:
+            return False
+        return all(os.path.exists(path) for path in marker["files"]) and \
+            _assets_present(marker["asset_index"], minecraft_directory)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+# Only mark versions whose every expected file is on disk, the library doesn't raise on every failed download.
+def _mark_installed(version, minecraft_directory):
+    stamp = _version_stamp(version, minecraft_directory)
+    expected = _expected_files(version, minecraft_directory)
+    marker = _install_marker(version, minecraft_directory)
+    if stamp is None or expected is None:
+        log.warning("Version %s is missing files after install, it will be checked again next time", version)
+        marker.unlink(missing_ok=True)
+        return
+    files, asset_index = expected
+    marker.write_bytes(_json_dumpb({"stamp": stamp[0], "files": files, "asset_index": asset_index}))
 
 # Install Minecraft version.
 def install_minecraft_version(version, minecraft_directory):
-    """Install Minecraft version"""
+    """Install Minecraft version, returning (success, error message or None)"""
     try:
-        
+        # Every launch installs first, skip re-verifying every library and asset once the version is complete
+        if _is_installed(version, minecraft_directory):
+            log.info("Version %s already installed", version)
+            return True, None
+
+        import minecraft_launcher_lib
+        from concurrent.futures import ThreadPoolExecutor
+
         # Check if Rosetta is needed for older versions on Apple Silicon
         if needs_rosetta(version):
-            logging.info(f"Version {version} requires Rosetta on Apple Silicon")
+            log.info("Version %s requires Rosetta on Apple Silicon", version)
         
-        # Configure session with timeout
-        session = requests.Session()
-        session.timeout = 30
+        # Resolve the version JSON through the shared manifest cache
+        _fetch_version_json(version, minecraft_directory)
         
-        # Install the version using minecraft_launcher_lib with timeout
-        minecraft_launcher_lib.install.install_minecraft_version(
-            version, 
-            minecraft_directory,
-            callback={"setStatus": lambda x: None, "setProgress": lambda x: None, "setMax": lambda x: None}
-        )
+        # Install the version using minecraft_launcher_lib, reusing pooled connections for every download.
+        # Its serial downloads run alongside the library and asset pools; they are written atomically,
+        # so if the library reaches one first it either finds the complete file or downloads its own copy.
+        with ThreadPoolExecutor(max_workers=3) as executor, _shared_session(), _fast_sha1():
+            prefetch = _prefetch_version_files(version, minecraft_directory, executor)
+            minecraft_launcher_lib.install.install_minecraft_version(
+                version, 
+                minecraft_directory,
+                callback={"setStatus": lambda x: None, "setProgress": lambda x: None, "setMax": lambda x: None}
+            )
+            for future in prefetch:
+                try:
+                    future.result()
+                except Exception as e:
+                    log.warning("Prefetch for %s failed, minecraft_launcher_lib downloaded it instead: %s", version, e)
         
-        logging.info(f"Version {version} installed successfully")
-        return True
+        _mark_installed(version, minecraft_directory)
+        log.info("Version %s installed successfully", version)
+        return True, None
         
     except FileExistsError as e:
         # Handle the case where natives directory already exists
         if "META-INF" in str(e) and "natives" in str(e):
-            logging.info(f"Version {version} natives already exist, installation completed")
-            return True
+            log.info("Version %s natives already exist, installation completed", version)
+            return True, None
         else:
-            logging.error(f"File exists error installing version {version}: {e}")
-            return False
+            error = f"File exists error installing version {version}: {e}"
+            log.error(error)
+            return False, error
     except Exception as e:
-        logging.error(f"Error installing version {version}: {e}")
-        return False
+        error = f"Error installing version {version}: {e}"
+        log.error(error)
+        return False, error
+
+# minecraft_launcher_lib's version, read like its get_library_version does but without importing the package.
+@lru_cache(maxsize=1)
+def _library_version():
+    import importlib.util
+
+    spec = importlib.util.find_spec("minecraft_launcher_lib")
+    with open(Path(spec.origin).with_name("version.txt"), encoding="utf-8") as f:
+        return f.read().strip()
+
+# Check a cached java path against what minecraft_launcher_lib's get_executable_path would pick now.
+def _java_path_unchanged(java_path, java_component, minecraft_directory):
+    if java_path is not None:
+        return os.path.isfile(java_path)
+    # No runtime was installed, still true as long as its directory doesn't exist
+    return java_component is None or not (Path(minecraft_directory) / "runtime" / java_component).exists()
+
+# Build the launch command, reusing a cached one while its version JSONs and Java runtime are unchanged.
+def _get_minecraft_command(version, minecraft_directory, options):
+    """Return the Minecraft command for options, with username and UUID filled in"""
+    # Cache a template without the per-user values, they're substituted below
+    template_options = dict(options, username=_USERNAME_PLACEHOLDER, uuid=_UUID_PLACEHOLDER)
+    cache_key = hashlib.sha1(json.dumps(
+        [version, str(minecraft_directory), template_options, _library_version()],
+        sort_keys=True
+    ).encode()).hexdigest()
+    cache_file = COMMAND_CACHE_DIR / f"{cache_key}.json"
+
+    # The command merges the whole inheritsFrom chain and picks java by whether the runtime is installed
+    stamp = _version_stamp(version, minecraft_directory)
+    java_component = None if stamp is None or "executablePath" in options else stamp[2]
+
+    # A hit never imports minecraft_launcher_lib
+    command = None
+    if stamp is not None:
+        try:
+            with open(cache_file, "rb") as f:
+                cached = _json_loads(f.read())
+            if cached["stamp"] == stamp[0] and \
+                    _java_path_unchanged(cached["java"], java_component, minecraft_directory):
+                command = cached["command"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    if command is None:
+        import minecraft_launcher_lib
+
+        command = minecraft_launcher_lib.command.get_minecraft_command(
+            version, minecraft_directory, template_options
+        )
+        if stamp is not None:
+            java_path = None
+            if java_component is not None:
+                java_path = minecraft_launcher_lib.runtime.get_executable_path(java_component, minecraft_directory)
+            try:
+                COMMAND_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(".tmp")
+                tmp_file.write_bytes(_json_dumpb({"stamp": stamp[0], "java": java_path, "command": command}))
+                os.replace(tmp_file, cache_file)
+            except OSError as e:
+                log.warning("Failed to cache launch command for %s: %s", version, e)
+
+    return [
+        arg.replace(_USERNAME_PLACEHOLDER, options["username"]).replace(_UUID_PLACEHOLDER, options["uuid"])
+        for arg in command
+    ]
+
+# Forward Minecraft's output to our stdout as-is.
+# Framing: launcher events (launch_result, exit, error) are single JSON lines carrying "frogdream": 1, each starting
+# on its own line. Every other line, JSON or not, is game output and the Rust side shows it as a log line.
+def _forward_logs(process):
+    """Copy the child's output until it closes the pipe"""
+    src = process.stdout.fileno()
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+
+    # On Linux, move the bytes pipe-to-pipe inside the kernel without copying them through Python
+    if hasattr(os, "splice"):
+        try:
+            while os.splice(src, out.fileno(), LOG_READ_SIZE, flags=os.SPLICE_F_MOVE):
+                pass
+            # Spliced data is never seen here, so always terminate the last line before the exit message
+            out.write(b"\n")
+            out.flush()
+            return
+        except OSError:
+            # stdout isn't something the kernel can splice into, copy the rest in userspace
+            pass
+
+    last = b"\n"
+    while True:
+        # os.read returns as soon as anything is available, so lines go out in real time
+        chunk = os.read(src, LOG_READ_SIZE)
+        if not chunk:
+            break
+        out.write(chunk)
+        out.flush()
+        last = chunk[-1:]
+
+    # Make sure the exit message starts on its own line
+    if last != b"\n":
+        out.write(b"\n")
+        out.flush()
+
+# Offline-mode UUID, derived like the vanilla server does (UUID.nameUUIDFromBytes("OfflinePlayer:<name>")).
+@lru_cache(maxsize=64)
+def _offline_uuid(username):
+    return str(uuid.UUID(bytes=hashlib.md5(f"OfflinePlayer:{username}".encode()).digest(), version=3))
 
 # Launch Minecraft with log streaming
-def launch_minecraft(username, version, minecraft_directory, game_dir=None):
-    """Launch Minecraft and stream logs to stdout"""
+def launch_minecraft(username, version, minecraft_directory, game_dir=None, detach=False):
+    """Launch Minecraft and stream logs to stdout, or discard its output and return once started if detach is set"""
     try:
+        # Rosetta check only implies Apple Silicon, so evaluate it once per launch
+        rosetta = needs_rosetta(version)
+
         # Generate Minecraft launch command using minecraft_launcher_lib
         options = {
             "username": username,
-            "uuid": str(uuid.uuid4()),
+            "uuid": _offline_uuid(username),
             "token": "dummy_token",
             "gameDirectory": game_dir or minecraft_directory,
-            "jvmArguments": ["-Xmx2G", "-Xms1G"]
+            "jvmArguments": list(JVM_ARGUMENTS)
         }
         
         # For older versions that need Rosetta, use x86_64 Java
-        if needs_rosetta(version) and is_apple_silicon():
+        if rosetta:
             # Use x86_64 Java 8 for older Minecraft versions
             java_8_path = "/Library/Java/JavaVirtualMachines/jdk1.8.0_351.jdk/Contents/Home/bin/java"
             if Path(java_8_path).exists():
                 options["executablePath"] = java_8_path
-                logging.info(f"Using x86_64 Java 8 for {version}")
+                log.info("Using x86_64 Java 8 for %s", version)
             else:
-                logging.warning(f"x86_64 Java 8 not found, using system Java with Rosetta")
+                log.warning("x86_64 Java 8 not found, using system Java with Rosetta")
         
-        command = minecraft_launcher_lib.command.get_minecraft_command(
-            version, minecraft_directory, options
-        )
+        command = _get_minecraft_command(version, minecraft_directory, options)
         
         # Check if Rosetta is needed for older versions on Apple Silicon
-        if needs_rosetta(version):
-            logging.info(f"Launching {version} with Rosetta compatibility")
+        if rosetta:
+            log.info("Launching %s with Rosetta compatibility", version)
             # Prepend arch -x86_64 to the entire command
             command = ["arch", "-x86_64"] + command
 
-        logging.info(f"Launching Minecraft {version} for user {username}")
-        logging.info(f"Command: {' '.join(command)}")
-
-        # Launch Minecraft with stdout/stderr capture
-        process = subprocess.Popen(
-            command, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE,  # Separate stderr to capture all logs
-            text=True, 
-            bufsize=0,  # Unbuffered for real-time logs
-            universal_newlines=True,
-            shell=False
-        )
+        log.info("Launching Minecraft %s for user %s", version, username)
+        # Joining the command is the only non-trivial formatting, skip it when INFO is filtered out
+        if log.isEnabledFor(logging.INFO):
+            log.info("Command: %s", " ".join(command))
+
+        if detach:
+            # Nobody reads the game's output here, so discard it instead of letting a pipe fill up
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                shell=False
+            )
+        else:
+            # Ask for a 1 MiB kernel pipe so bursts of log output don't stall the game (Python 3.10+, Linux)
+            pipe_options = {"pipesize": LOG_PIPE_SIZE} if sys.version_info >= (3, 10) else {}
+
+            # Launch Minecraft with stdout/stderr capture
+            process = subprocess.Popen(
+                command, 
+                stdin=subprocess.DEVNULL,  # Never hand the game our stdin, in serve mode it's the command pipe
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.STDOUT,  # Merge stderr so logs keep their original order
+                bufsize=0,  # Raw pipe, the fd is read directly
+                shell=False,
+                **pipe_options
+            )
         
         # Send initial success message
         print(json.dumps({
+            "frogdream": 1,
             "type": "launch_result",
             "success": True,
             "pid": process.pid,
             "message": f"Minecraft {version} launched successfully"
         }), flush=True)
+
+        if detach:
+            return 0
         
-        # Stream logs in real-time from both stdout and stderr
-        import threading
-        
-        def read_stdout():
-            try:
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        print(json.dumps({
-                            "type": "log",
-                            "line": line.strip(),
-                            "pid": process.pid
-                        }), flush=True)
-            except Exception as e:
-                logging.error(f"Error reading stdout: {e}")
-        
-        def read_stderr():
-            try:
-                for line in iter(process.stderr.readline, ''):
-                    if line:
-                        print(json.dumps({
-                            "type": "log",
-                            "line": f"[STDERR] {line.strip()}",
-                            "pid": process.pid
-                        }), flush=True)
-            except Exception as e:
-                logging.error(f"Error reading stderr: {e}")
-        
-        # Start reading threads
-        stdout_thread = threading.Thread(target=read_stdout)
-        stderr_thread = threading.Thread(target=read_stderr)
-        stdout_thread.daemon = True
-        stderr_thread.daemon = True
-        stdout_thread.start()
-        stderr_thread.start()
+        # Stream logs in real-time, the launch result above already carries the pid
+        _forward_logs(process)
 
         # Wait for process to complete and get exit code
         exit_code = process.wait()
         
-        # Wait for reading threads to complete
-        stdout_thread.join(timeout=5)
-        stderr_thread.join(timeout=5)
-        
         # Send final status
         print(json.dumps({
+            "frogdream": 1,
             "type": "exit",
             "pid": process.pid,
             "exit_code": exit_code,
@@ -190,18 +742,55 @@ def launch_minecraft(username, version, minecraft_directory, game_dir=None):
         
     except Exception as e:
         error_msg = f"Error launching Minecraft: {e}"
-        logging.error(error_msg)
+        log.error(error_msg)
         print(json.dumps({
+            "frogdream": 1,
             "type": "error",
             "success": False,
             "message": error_msg
         }), flush=True)
         return 1
 
+# Run one JSON request from serve mode and build its response.
+def _handle_request(request):
+    """Dispatch a serve mode request to install or launch"""
+    command = request.get("command")
+    if command == "install":
+        success, error = install_minecraft_version(request["version"], request["minecraft_dir"])
+        return {"success": success, "error": error}
+    if command == "launch":
+        # Detached by default, a streaming launch would hold the loop and mix game output into the responses
+        exit_code = launch_minecraft(
+            request["username"],
+            request["version"],
+            request["minecraft_dir"],
+            request.get("game_dir"),
+            request.get("detach", True),
+        )
+        return {"success": exit_code == 0, "exit_code": exit_code}
+    return {"success": False, "error": f"Unknown command: {command}"}
+
+# Keep the interpreter and imported modules warm across commands read from stdin.
+def serve():
+    """Read one JSON request per line from stdin and answer each with a response line"""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = _handle_request(request)
+        except Exception as e:
+            log.error("Failed to handle request: %s", e)
+            response = {"success": False, "error": str(e)}
+        response.update({"type": "response", "id": request_id})
+        print(json.dumps(response), flush=True)
+
 # Entry point when called from Rust launcher.
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        logging.error("Usage: launcher.py <command> [args...]")
+        log.error("Usage: launcher.py <command> [args...]")
         print(json.dumps({"success": False, "error": "Invalid arguments"}))
         exit(1)
 
@@ -211,25 +800,31 @@ if __name__ == "__main__":
         # Install version
         version = sys.argv[2]
         minecraft_dir = sys.argv[3]
-        success = install_minecraft_version(version, minecraft_dir)
+        success, error = install_minecraft_version(version, minecraft_dir)
         result = {"success": success}
+        if error:
+            result["error"] = error
         print(json.dumps(result))
         if not success:
             exit(1)
-    elif command == "launch" and len(sys.argv) == 6:
-        # Launch Minecraft with log streaming
+    elif command == "launch" and (len(sys.argv) == 6 or (len(sys.argv) == 7 and sys.argv[6] == "--detach")):
+        # Launch Minecraft with log streaming, unless --detach is given (game output is then discarded)
         username = sys.argv[2]
         version = sys.argv[3]
         minecraft_dir = sys.argv[4]
         game_dir = sys.argv[5]
-        exit_code = launch_minecraft(username, version, minecraft_dir, game_dir)
+        detach = len(sys.argv) == 7
+        exit_code = launch_minecraft(username, version, minecraft_dir, game_dir, detach)
         exit(exit_code)
+    elif command == "serve" and len(sys.argv) == 2:
+        # Resident mode, commands arrive as JSON lines on stdin
+        serve()
     elif command == "logs" and len(sys.argv) == 3:
         # Get logs from running process
         pid = int(sys.argv[2])
         result = get_minecraft_logs(pid)
         print(json.dumps(result))
     else:
-        logging.error("Invalid command or arguments")
+        log.error("Invalid command or arguments")
         print(json.dumps({"success": False, "error": "Invalid command"}))
         exit(1)
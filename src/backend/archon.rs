@@ -5,6 +5,7 @@ use log::{debug, error, info, trace, warn};
 use serde_json::Value;
 use std::collections::HashMap;
 use std::sync::Arc;
+use tokio::io::{AsyncBufReadExt, AsyncWriteExt, BufReader};
 use tokio::sync::{RwLock, mpsc};
 use tokio::task::JoinHandle;
 
@@ -65,6 +66,73 @@ pub struct NetworkResponse {
     pub error: Option<String>,
 }
 
+/// Resident `launcher.py serve` process, reused so each request skips Python startup and imports.
+struct PythonServer {
+    _child: tokio::process::Child,
+    stdin: tokio::process::ChildStdin,
+    stdout: BufReader<tokio::process::ChildStdout>,
+    next_id: u64,
+}
+
+impl PythonServer {
+    /// Spawn the Python launcher in serve mode.
+    fn spawn() -> Result<Self> {
+        let python_script = std::env::current_dir()?.join("python").join("launcher.py");
+
+        let mut child = tokio::process::Command::new("python3")
+            .arg(python_script)
+            .arg("serve")
+            .stdin(std::process::Stdio::piped())
+            .stdout(std::process::Stdio::piped())
+            .kill_on_drop(true)
+            .spawn()?;
+
+        let stdin = child
+            .stdin
+            .take()
+            .ok_or_else(|| anyhow::anyhow!("Failed to capture stdin"))?;
+        let stdout = child
+            .stdout
+            .take()
+            .ok_or_else(|| anyhow::anyhow!("Failed to capture stdout"))?;
+
+        Ok(Self {
+            _child: child,
+            stdin,
+            stdout: BufReader::new(stdout),
+            next_id: 0,
+        })
+    }
+
+    /// Send a request and wait for the response with the matching id.
+    async fn request(&mut self, mut request: Value) -> Result<Value> {
+        self.next_id += 1;
+        let id = self.next_id;
+        request["id"] = Value::from(id);
+
+        let mut line = serde_json::to_vec(&request)?;
+        line.push(b'\n');
+        self.stdin.write_all(&line).await?;
+        self.stdin.flush().await?;
+
+        let mut buf = String::new();
+        loop {
+            buf.clear();
+            if self.stdout.read_line(&mut buf).await? == 0 {
+                return Err(anyhow::anyhow!("Python launcher exited"));
+            }
+            // Skip anything that isn't this request's response
+            let response = serde_json::from_str::<Value>(&buf).ok().filter(|response| {
+                response.get("type").and_then(Value::as_str) == Some("response")
+                    && response.get("id").and_then(Value::as_u64) == Some(id)
+            });
+            if let Some(response) = response {
+                return Ok(response);
+            }
+        }
+    }
+}
+
 /// Thread manager.
 #[derive(Debug, Clone)]
 pub struct Archon {
@@ -99,6 +167,9 @@ impl Archon {
         mut rx: mpsc::UnboundedReceiver<ArchonMessage>,
         running_processes: Arc<RwLock<HashMap<u32, tokio::process::Child>>>,
     ) {
+        // Messages are handled one at a time, so the resident Python process needs no lock
+        let mut python_server = None;
+
         while let Some(message) = rx.recv().await {
             match message {
                 ArchonMessage::Python {
@@ -106,8 +177,13 @@ impl Archon {
                     args,
                     response_tx,
                 } => {
-                    let result =
-                        Self::handle_python_operation(operation, args, &running_processes).await;
+                    let result = Self::handle_python_operation(
+                        operation,
+                        args,
+                        &running_processes,
+                        &mut python_server,
+                    )
+                    .await;
                     if let Some(tx) = response_tx {
                         let _ = tx.send(result);
                     }
@@ -154,6 +230,7 @@ impl Archon {
         operation: String,
         args: Vec<String>,
         running_processes: &Arc<RwLock<HashMap<u32, tokio::process::Child>>>,
+        python_server: &mut Option<PythonServer>,
     ) -> PythonResponse {
         match operation.as_str() {
             "launch_minecraft" => {
@@ -203,7 +280,7 @@ impl Archon {
                 let version = &args[0];
                 let minecraft_dir = &args[1];
 
-                match Self::install_minecraft_process(version, minecraft_dir).await {
+                match Self::install_minecraft_process(version, minecraft_dir, python_server).await {
                     Ok(_) => PythonResponse {
                         success: true,
                         data: None,
@@ -241,8 +318,9 @@ impl Archon {
             .arg(version)
             .arg(minecraft_dir)
             .arg(game_dir)
-            .stdout(std::process::Stdio::piped())
-            .stderr(std::process::Stdio::piped());
+            // Output is never read here, a pipe would eventually fill and block the launcher
+            .stdout(std::process::Stdio::null())
+            .stderr(std::process::Stdio::null());
 
         let child = cmd.spawn()?;
         let pid = child.id().unwrap_or(0);
@@ -254,23 +332,39 @@ impl Archon {
         Ok(pid)
     }
 
-    /// Install Minecraft process.
-    async fn install_minecraft_process(version: &str, minecraft_dir: &str) -> Result<()> {
-        let python_script = std::env::current_dir()?.join("python").join("launcher.py");
+    /// Install Minecraft through the resident Python launcher.
+    async fn install_minecraft_process(
+        version: &str,
+        minecraft_dir: &str,
+        python_server: &mut Option<PythonServer>,
+    ) -> Result<()> {
+        let server = match python_server {
+            Some(server) => server,
+            None => python_server.insert(PythonServer::spawn()?),
+        };
 
-        let output = tokio::process::Command::new("python3")
-            .arg(python_script)
-            .arg("install")
-            .arg(version)
-            .arg(minecraft_dir)
-            .output()
-            .await?;
+        let request = serde_json::json!({
+            "command": "install",
+            "version": version,
+            "minecraft_dir": minecraft_dir,
+        });
+        let response = match server.request(request).await {
+            Ok(response) => response,
+            Err(e) => {
+                // Drop the broken process, the next request spawns a fresh one
+                *python_server = None;
+                return Err(anyhow::anyhow!("Installation failed: {e}"));
+            }
+        };
 
-        if output.status.success() {
+        if response.get("success").and_then(Value::as_bool) == Some(true) {
             info!("Minecraft {version} installed successfully");
             Ok(())
         } else {
-            let error = String::from_utf8_lossy(&output.stderr);
+            let error = response
+                .get("error")
+                .and_then(Value::as_str)
+                .unwrap_or("see launcher log");
             Err(anyhow::anyhow!("Installation failed: {error}"))
         }
     }
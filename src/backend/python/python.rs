@@ -137,13 +137,21 @@ impl EmbeddedPythonBridge {
 
         // Read output in the main task to avoid Send issues
         use tokio::io::{AsyncBufReadExt, BufReader};
-        let reader = BufReader::new(stdout);
-        let mut lines = reader.lines();
+        let mut reader = BufReader::new(stdout);
 
-        // Spawn a task to read lines and send them through a channel
+        // Spawn a task to read lines and send them through a channel.
+        // Game output is forwarded raw, so decode lossily instead of stopping on invalid UTF-8.
         let (tx, mut rx) = tokio::sync::mpsc::unbounded_channel::<String>();
         let reader_task = tokio::spawn(async move {
-            while let Ok(Some(line)) = lines.next_line().await {
+            let mut buf = Vec::new();
+            while let Ok(n) = reader.read_until(b'\n', &mut buf).await {
+                if n == 0 {
+                    break;
+                }
+                let line = String::from_utf8_lossy(&buf)
+                    .trim_end_matches(['\n', '\r'])
+                    .to_string();
+                buf.clear();
                 if tx.send(line).is_err() {
                     break;
                 }
@@ -153,7 +161,13 @@ impl EmbeddedPythonBridge {
         // Process messages in the main task to avoid Send issues
         tokio::spawn(async move {
             while let Some(line) = rx.recv().await {
-                if let Ok(json_msg) = serde_json::from_str::<serde_json::Value>(&line) {
+                // Game output shares this stream, only lines tagged "frogdream": 1 are launcher events
+                let event = serde_json::from_str::<serde_json::Value>(&line)
+                    .ok()
+                    .filter(|msg| {
+                        msg.get("frogdream").and_then(serde_json::Value::as_u64) == Some(1)
+                    });
+                if let Some(json_msg) = event {
                     match json_msg.get("type").and_then(|t| t.as_str()) {
                         Some("launch_result") => {
                             let success = json_msg
@@ -230,8 +244,8 @@ impl EmbeddedPythonBridge {
                             log_callback(MinecraftLogMessage::Log { line, pid: None });
                         }
                     }
-                } else {
-                    // Not JSON, treat as regular log line
+                } else if !line.trim().is_empty() {
+                    // Not a launcher event, treat as regular log line
                     log_callback(MinecraftLogMessage::Log { line, pid: None });
                 }
             }